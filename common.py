@@ -0,0 +1,82 @@
+"""
+Helpers shared by the TrendHire services and the Bright Data scraping clients.
+"""
+
+import os
+from string import Formatter
+from typing import Dict, Optional
+from urllib.parse import urljoin, quote_plus
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# The only placeholders a search URL template may use
+SEARCH_TEMPLATE_FIELDS = frozenset({"query", "location", "page"})
+
+
+def load_env_once():
+    """Load variables from .env, once per process tree"""
+    # Workers forked from a parent that already loaded .env inherit its environment
+    if not os.environ.get("_TRENDHIRE_ENV_LOADED"):
+        load_dotenv(override=False)
+        os.environ["_TRENDHIRE_ENV_LOADED"] = "1"
+
+
+def default_headers(headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Request headers for scraping, with a browser User-Agent unless headers are given"""
+    headers = headers or {"User-Agent": DEFAULT_USER_AGENT}
+    # Ask for compressed pages; both HTTP clients decode gzip/deflate/br transparently
+    if not any(k.lower() == "accept-encoding" for k in headers):
+        headers = {**headers, "Accept-Encoding": "gzip, deflate, br"}
+    return headers
+
+
+def check_search_template(template: str):
+    """
+    Raise ValueError unless template only uses {query}, {location} and {page}
+
+    Literal braces, e.g. in a JSON query parameter, must be doubled ({{ and }}).
+    """
+    try:
+        fields = {name for _, name, _, _ in Formatter().parse(template) if name is not None}
+    except ValueError as e:
+        raise ValueError(f"Invalid search URL template {template!r}: {e}") from e
+    unknown = fields - SEARCH_TEMPLATE_FIELDS
+    if unknown:
+        raise ValueError(
+            f"Search URL template {template!r} has unknown placeholders {sorted(unknown)}; "
+            "only {query}, {location} and {page} are allowed, and literal braces must be doubled"
+        )
+
+
+def render_search_url(base_url: str, template: str, query: str, location: Optional[str] = None, page: int = 1) -> str:
+    """Fill a template accepted by check_search_template in a single pass"""
+    # Relative templates are resolved against base_url
+    return urljoin(base_url, template.format_map({
+        "query": quote_plus(query),
+        "location": quote_plus(location or ""),
+        "page": page
+    }))
+
+
+def pooled_session(proxies: Optional[Dict[str, str]] = None) -> requests.Session:
+    """
+    Builds a requests.Session with a keep-alive connection pool and retries on transient errors.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if proxies:
+        # Environment proxy variables would otherwise take precedence over session.proxies
+        session.trust_env = False
+        session.proxies = proxies
+    return session
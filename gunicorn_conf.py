@@ -0,0 +1,15 @@
+"""
+Gunicorn settings for serving trendhire_api across all cores.
+
+Run with: gunicorn trendhire_api:app -c gunicorn_conf.py
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", 2 * (os.cpu_count() or 1) + 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+worker_connections = 1000
+keepalive = 5
+# Import the app once in the master so workers share its pages copy-on-write
+preload_app = True
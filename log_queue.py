@@ -0,0 +1,59 @@
+"""
+Non-blocking logging for the async services.
+
+Log calls only enqueue the record; a background thread does the actual
+write to stderr, so a slow terminal or pipe never stalls the event loop.
+"""
+
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+class _Listener(QueueListener):
+    """QueueListener whose start() and stop() may be called more than once"""
+
+    def start(self):
+        if self._thread is None:
+            super().start()
+
+    def stop(self):
+        if self._thread is not None:
+            super().stop()
+
+
+def configure_logging(level: int = logging.INFO) -> QueueListener:
+    """
+    Route root logging through a queue and start the listener that drains it
+
+    Services start the listener when they start up and stop it on shutdown to
+    flush any records still queued; both calls are safe to repeat, so an app can
+    be started and stopped more than once per process. Anything still queued is
+    flushed at interpreter exit, and forked children restart the listener
+    automatically.
+    """
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.handlers[:] = [queue_handler]
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    listener = _Listener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    def restart_in_child():
+        # The listener thread doesn't survive fork (e.g. gunicorn preload_app),
+        # so each child drains a fresh queue with its own thread
+        fresh = queue.SimpleQueue()
+        queue_handler.queue = fresh
+        listener.queue = fresh
+        listener._thread = None
+        listener.start()
+
+    os.register_at_fork(after_in_child=restart_in_child)
+    return listener
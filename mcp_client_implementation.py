@@ -4,49 +4,204 @@ This module provides integration with Bright Data proxy services for web scrapin
 """
 
 import os
+import re
+import sys
 import logging
 import aiohttp
 import asyncio
 import requests
-from typing import Dict, List, Any, Optional
-from urllib.parse import urljoin
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple, Union
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+from functools import lru_cache
+from selectolax.lexbor import LexborHTMLParser
+from cssselect import GenericTranslator, SelectorError
+from lxml import etree, html as lxml_html
+from bs4 import BeautifulSoup, SoupStrainer
+from common import check_search_template, default_headers, pooled_session, render_search_url
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("mcp_integration")
 
+@lru_cache(maxsize=None)
+def _compile_selector(selector: str) -> etree.XPath:
+    """Translate a CSS selector to a compiled XPath once per process"""
+    try:
+        xpath = GenericTranslator().css_to_xpath(selector)
+    except SelectorError as e:
+        # ValueError lets pydantic report a bad selector as a validation error
+        raise ValueError(f"Invalid CSS selector {selector!r}: {e}") from e
+    return etree.XPath(xpath)
+
+
+# Selectors simple enough to restrict tree construction: "tag", ".class", "tag.class" or "#id"
+_SIMPLE_SELECTOR = re.compile(r"^(?:(?P<tag>[a-zA-Z][\w-]*)?(?:\.(?P<cls>[\w-]+))?|#(?P<id>[\w-]+))$")
+
+
+@lru_cache(maxsize=None)
+def _strainer_for(selector: str) -> Optional[SoupStrainer]:
+    """Build a SoupStrainer for a simple selector, or None if it needs a full parse"""
+    match = _SIMPLE_SELECTOR.match(selector.strip())
+    if not match or not any(match.groupdict().values()):
+        return None
+    if match["id"]:
+        return SoupStrainer(id=match["id"])
+    if match["cls"]:
+        return SoupStrainer(match["tag"], class_=match["cls"])
+    return SoupStrainer(match["tag"])
+
+
+@dataclass(slots=True, frozen=True)
 class SourceConfig:
     """Configuration for a specific data source to crawl"""
-    def __init__(self, 
-                 name: str, 
-                 base_url: str, 
-                 search_url_template: str,
-                 listing_selector: str,
-                 detail_selectors: Dict[str, str] = None,
-                 headers: Dict[str, str] = None):
-        self.name = name
-        self.base_url = base_url
-        self.search_url_template = search_url_template
-        self.listing_selector = listing_selector
-        self.detail_selectors = detail_selectors or {}
-        self.headers = headers or {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
+    name: str
+    base_url: str
+    search_url_template: str
+    listing_selector: str
+    detail_selectors: Dict[str, str] = field(default_factory=dict)
+    headers: Optional[Dict[str, str]] = None
+    parser: str = "lexbor"
+    
+    def __post_init__(self):
+        # Frozen, so derived values are assigned through object.__setattr__
+        object.__setattr__(self, "name", sys.intern(self.name))
+        object.__setattr__(self, "headers", default_headers(self.headers))
+        # Raises ValueError, so pydantic reports a bad template as a validation error
+        check_search_template(self.search_url_template)
+        if self.parser == "lxml":
+            # Compile selectors up front so bad selectors fail at config load, not mid-crawl
+            _compile_selector(self.listing_selector)
+            for selector in self.detail_selectors.values():
+                _compile_selector(selector)
+    
+    @property
+    def listing_xpath(self) -> etree.XPath:
+        """Compiled XPath for listing_selector"""
+        return _compile_selector(self.listing_selector)
+    
+    @property
+    def detail_xpaths(self) -> Dict[str, etree.XPath]:
+        """Compiled XPaths for detail_selectors"""
+        return {key: _compile_selector(sel) for key, sel in self.detail_selectors.items()}
     
     def get_search_url(self, query: str, location: str = None, page: int = 1) -> str:
         """Generate search URL based on template and parameters"""
-        url = self.search_url_template
-        url = url.replace("{query}", query)
-        if location and "{location}" in url:
-            url = url.replace("{location}", location)
-        if "{page}" in url:
-            url = url.replace("{page}", str(page))
+        return render_search_url(self.base_url, self.search_url_template, query, location, page)
+
+
+@dataclass(slots=True)
+class Listing:
+    """A single scraped listing"""
+    source: str
+    title: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    url: Optional[str] = None
+    posted_date: Optional[str] = None
+    salary: Optional[str] = None
+    raw: Dict[str, Any] = field(default_factory=dict)
+    
+    @classmethod
+    def from_fields(cls, source: str, fields: Dict[str, Any]) -> "Listing":
+        """Build a listing from the values extracted by a source's detail selectors"""
+        location = fields.get("location")
+        return cls(
+            source=source,
+            title=fields.get("title"),
+            company=fields.get("company"),
+            # Locations repeat heavily across listings
+            location=sys.intern(location) if location else location,
+            url=fields.get("job_link"),
+            posted_date=fields.get("posted_date"),
+            salary=fields.get("salary"),
+            raw=fields
+        )
+
+
+def _parse_listing(html: Union[str, bytes], cfg: SourceConfig) -> List[Listing]:
+    """
+    Extract listings from a search results page
+    
+    Args:
+        html: Page content, as text or raw bytes
+        cfg: Source configuration providing listing and detail selectors
         
-        # Ensure the URL is properly joined if it's a relative path
-        if not url.startswith("http"):
-            url = urljoin(self.base_url, url)
-            
-        return url
+    Returns:
+        One Listing per match of the listing selector
+    """
+    if cfg.parser == "lxml":
+        return _parse_listing_lxml(html, cfg)
+    if cfg.parser == "bs4":
+        return _parse_listing_bs4(html, cfg)
+    
+    tree = LexborHTMLParser(html)
+    rows = []
+    
+    for node in tree.css(cfg.listing_selector):
+        row = {}
+        for key, selector in cfg.detail_selectors.items():
+            match = node.css_first(selector)
+            if match is None:
+                row[key] = None
+            elif match.tag == "a" and match.attributes.get("href"):
+                # Links are resolved against the source so they can be fetched directly
+                row[key] = urljoin(cfg.base_url, match.attributes["href"])
+            else:
+                row[key] = match.text(strip=True)
+        rows.append(Listing.from_fields(cfg.name, row))
+    
+    return rows
+
+
+def _parse_listing_lxml(html: Union[str, bytes], cfg: SourceConfig) -> List[Listing]:
+    """Extract listings with lxml using the source's precompiled XPaths"""
+    tree = lxml_html.fromstring(html)
+    detail_xpaths = cfg.detail_xpaths
+    rows = []
+    
+    for node in cfg.listing_xpath(tree):
+        row = {}
+        for key, xpath in detail_xpaths.items():
+            matches = xpath(node)
+            if not matches:
+                row[key] = None
+            elif matches[0].tag == "a" and matches[0].get("href"):
+                row[key] = urljoin(cfg.base_url, matches[0].get("href"))
+            else:
+                row[key] = matches[0].text_content().strip()
+        rows.append(Listing.from_fields(cfg.name, row))
+    
+    return rows
+
+
+def _parse_listing_bs4(html: Union[str, bytes], cfg: SourceConfig) -> List[Listing]:
+    """Extract listings with BeautifulSoup, building only the listing subtrees when possible"""
+    strainer = _strainer_for(cfg.listing_selector)
+    soup = BeautifulSoup(html, "lxml", parse_only=strainer)
+    rows = []
+    
+    for node in soup.select(cfg.listing_selector):
+        row = {}
+        for key, selector in cfg.detail_selectors.items():
+            match = node.select_one(selector)
+            if match is None:
+                row[key] = None
+            elif match.name == "a" and match.get("href"):
+                row[key] = urljoin(cfg.base_url, match["href"])
+            else:
+                row[key] = match.get_text(strip=True)
+        rows.append(Listing.from_fields(cfg.name, row))
+    
+    return rows
+
+
+def _canonicalize(url: str) -> str:
+    """Normalize a URL so logically identical pages compare equal (host case, query order, fragment)"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
 
 
 class MCPClient:
@@ -60,7 +215,8 @@ class MCPClient:
                  username: Optional[str] = None,
                  password: Optional[str] = None,
                  host: Optional[str] = None,
-                 port: Optional[int] = None):
+                 port: Optional[int] = None,
+                 session: Optional[aiohttp.ClientSession] = None):
         """
         Initialize the MCP Client with Bright Data credentials
         
@@ -70,6 +226,7 @@ class MCPClient:
             password: Bright Data password
             host: Bright Data proxy host
             port: Bright Data proxy port
+            session: Optional application-wide aiohttp session; the caller keeps ownership
         """
         # Load credentials from environment variables if not provided
         self.api_key = api_key or os.environ.get("BRIGHT_DATA_API_KEY")
@@ -90,17 +247,37 @@ class MCPClient:
             "https": self.proxy_url
         }
         
-        # Session for making API requests
-        self.session = None
+        # Pooled session for synchronous requests so proxy connections are kept alive;
+        # proxy and default headers are set once here instead of on every request
+        self.http = pooled_session(self.proxies)
+        self.http.headers.update(default_headers())
+        
+        # Session for making API requests (shared sessions are never closed by the client)
+        self.session = session
+        self._owns_session = session is None
+    
+    def __enter__(self):
+        """Context manager entry"""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.close()
+    
+    def close(self):
+        """Close the pooled synchronous session"""
+        self.http.close()
     
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession()
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
+            self._owns_session = True
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
             self.session = None
     
@@ -116,10 +293,9 @@ class MCPClient:
             requests.Response object
         """
         try:
-            response = requests.get(
+            response = self.http.get(
                 url,
                 headers=headers,
-                proxies=self.proxies,
                 timeout=30
             )
             response.raise_for_status()
@@ -128,19 +304,20 @@ class MCPClient:
             logger.error(f"Error fetching {url}: {str(e)}")
             raise
     
-    async def fetch_async(self, url: str, headers: Dict[str, str] = None) -> str:
+    async def fetch_async(self, url: str, headers: Dict[str, str] = None, raw: bool = False) -> Union[str, bytes]:
         """
         Asynchronously fetch content from a URL using Bright Data proxy
         
         Args:
             url: The URL to fetch
             headers: Optional request headers
+            raw: Return the undecoded body, for parsers that accept bytes
             
         Returns:
-            Response content as text
+            Response content as text, or bytes when raw is set
         """
         if not self.session:
-            raise RuntimeError("Session not initialized. Use as async context manager.")
+            raise RuntimeError("Session not initialized. Pass a shared session or use as async context manager.")
             
         proxy_auth = aiohttp.BasicAuth(self.username, self.password)
         
@@ -153,26 +330,35 @@ class MCPClient:
                 timeout=aiohttp.ClientTimeout(total=30)
             ) as response:
                 response.raise_for_status()
+                if raw:
+                    return await response.read()
                 return await response.text()
         except aiohttp.ClientError as e:
             logger.error(f"Error fetching {url}: {str(e)}")
             raise
     
-    def get_account_info(self) -> Dict[str, Any]:
+    async def get_account_info(self) -> Dict[str, Any]:
         """
         Get Bright Data account information
         
         Returns:
             Dict containing account information
         """
-        url = f"https://api.brightdata.com/accounts/me"
+        if not self.session:
+            raise RuntimeError("Session not initialized. Pass a shared session or use as async context manager.")
+            
+        url = "https://api.brightdata.com/accounts/me"
         headers = {"Authorization": f"Bearer {self.api_key}"}
         
         try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            async with self.session.get(
+                url,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
+                response.raise_for_status()
+                return await response.json()
+        except aiohttp.ClientError as e:
             logger.error(f"Error fetching account info: {str(e)}")
             raise
 
@@ -182,18 +368,57 @@ class MCPSourceCrawler:
     Crawler for specific data sources using the MCP client
     """
     
-    def __init__(self, client: MCPClient, source_config: SourceConfig):
+    def __init__(self, 
+                 client: MCPClient, 
+                 source_config: SourceConfig, 
+                 concurrency: int = 20,
+                 executor: Optional[Executor] = None):
         """
         Initialize the crawler with MCP client and source configuration
         
         Args:
             client: Initialized MCPClient
             source_config: Configuration for the data source
+            concurrency: Maximum number of pages being fetched or parsed at once
+            executor: Optional process pool for HTML parsing, keeping it off the event loop
         """
         self.client = client
         self.config = source_config
+        self.executor = executor
+        self.concurrency = concurrency
+        self._sem = asyncio.BoundedSemaphore(concurrency)
+        # Pages of the last search_async call that could not be fetched or parsed
+        self.failed_pages = 0
     
-    def search(self, query: str, location: str = None, max_pages: int = 1) -> List[Dict[str, Any]]:
+    def _page_urls(self, query: str, location: str, max_pages: int) -> List[Tuple[int, str]]:
+        """
+        Build the distinct search URLs to fetch
+        
+        Args:
+            query: Search query term
+            location: Optional location filter
+            max_pages: Maximum number of pages to crawl
+            
+        Returns:
+            (page, url) pairs, skipping pages whose URL duplicates an earlier one
+        """
+        if max_pages > 1 and "{page}" not in self.config.search_url_template:
+            logger.warning(f"{self.config.name} search template has no {{page}} placeholder; fetching 1 page instead of {max_pages}")
+            max_pages = 1
+        
+        urls = []
+        seen = set()
+        for page in range(1, max_pages + 1):
+            url = self.config.get_search_url(query, location, page)
+            canon = _canonicalize(url)
+            if canon in seen:
+                continue
+            seen.add(canon)
+            urls.append((page, url))
+        
+        return urls
+    
+    def search(self, query: str, location: str = None, max_pages: int = 1) -> List[Listing]:
         """
         Search the data source for listings
         
@@ -207,31 +432,15 @@ class MCPSourceCrawler:
         """
         results = []
         
-        for page in range(1, max_pages + 1):
+        for page, url in self._page_urls(query, location, max_pages):
             try:
-                # Generate search URL for this page
-                url = self.config.get_search_url(query, location, page)
-                
                 # Fetch search results
                 logger.info(f"Fetching page {page} from {self.config.name}: {url}")
                 response = self.client.fetch(url, headers=self.config.headers)
                 
-                # Process results (this is a placeholder - you would typically use BeautifulSoup or similar here)
-                # For a real implementation, you'd parse the HTML and extract data based on the selectors
-                logger.info(f"Successfully retrieved page {page}")
-                
-                # Example placeholder for results processing
-                # In a real implementation, you would extract data based on self.config.listing_selector
-                # and self.config.detail_selectors
-                sample_result = {
-                    "source": self.config.name,
-                    "url": url,
-                    "page": page,
-                    "query": query,
-                    "location": location,
-                    "results_count": 0  # This would be populated with actual results count
-                }
-                results.append(sample_result)
+                rows = _parse_listing(response.text, self.config)
+                logger.info(f"Successfully retrieved page {page} ({len(rows)} listings)")
+                results.extend(rows)
                 
             except Exception as e:
                 logger.error(f"Error searching {self.config.name}: {str(e)}")
@@ -239,40 +448,64 @@ class MCPSourceCrawler:
                 
         return results
     
-    async def search_async(self, query: str, location: str = None, max_pages: int = 1) -> List[Dict[str, Any]]:
+    async def search_async(self, query: str, location: str = None, max_pages: int = 1) -> AsyncIterator[Listing]:
         """
         Asynchronously search the data source for listings
         
+        Listings are yielded as soon as their page has been parsed, so callers can
+        store them while later pages are still being fetched. Use
+        `[row async for row in crawler.search_async(...)]` to collect a list.
+        
         Args:
             query: Search query term
             location: Optional location filter
             max_pages: Maximum number of pages to crawl
             
-        Returns:
-            List of listing details
-        """
-        results = []
-        tasks = []
+        Yields:
+            Listing details
         
-        # Create tasks for all pages
-        for page in range(1, max_pages + 1):
-            url = self.config.get_search_url(query, location, page)
-            task = asyncio.create_task(self._fetch_page(url, page, query, location))
-            tasks.append(task)
+        Pages that fail are skipped and counted in failed_pages; if every page
+        fails, RuntimeError is raised once the others have been consumed.
+        """
+        urls = self._page_urls(query, location, max_pages)
+        pages = iter(urls)
+        self.failed_pages = 0
+        last_error = None
+        # Bounded so fetching pauses when the caller falls behind
+        queue = asyncio.Queue(maxsize=2 * self.concurrency)
+        done = object()
         
-        # Wait for all tasks to complete
-        completed_results = await asyncio.gather(*tasks, return_exceptions=True)
+        async def fetch_pages():
+            nonlocal last_error
+            # A fixed pool of fetchers pulls from the shared page iterator
+            for page, url in pages:
+                try:
+                    rows = await self._fetch_page(url, page, query, location)
+                except Exception as e:
+                    # Already logged by _fetch_page
+                    self.failed_pages += 1
+                    last_error = e
+                    continue
+                await queue.put(rows)
+            await queue.put(done)
         
-        # Process results
-        for result in completed_results:
-            if isinstance(result, Exception):
-                logger.error(f"Error in async search: {str(result)}")
-            else:
-                results.extend(result)
-                
-        return results
+        workers = [asyncio.create_task(fetch_pages()) for _ in range(self.concurrency)]
+        try:
+            remaining = len(workers)
+            while remaining:
+                rows = await queue.get()
+                if rows is done:
+                    remaining -= 1
+                    continue
+                for row in rows:
+                    yield row
+            if urls and self.failed_pages == len(urls):
+                raise RuntimeError(f"All {len(urls)} pages from {self.config.name} failed") from last_error
+        finally:
+            for worker in workers:
+                worker.cancel()
     
-    async def _fetch_page(self, url: str, page: int, query: str, location: str) -> List[Dict[str, Any]]:
+    async def _fetch_page(self, url: str, page: int, query: str, location: str) -> List[Listing]:
         """
         Fetch and process a single page of results
         
@@ -286,21 +519,17 @@ class MCPSourceCrawler:
             List of listings from this page
         """
         try:
-            logger.info(f"Fetching page {page} from {self.config.name}: {url}")
-            content = await self.client.fetch_async(url, headers=self.config.headers)
-            
-            # Process results (placeholder)
-            # In a real implementation, you would parse the HTML and extract data
-            sample_result = {
-                "source": self.config.name,
-                "url": url,
-                "page": page,
-                "query": query,
-                "location": location,
-                "results_count": 0  # This would be populated with actual results
-            }
-            
-            return [sample_result]
+            # Parsing stays under the semaphore so fetched pages can't pile up in memory
+            # faster than the pool works through them
+            async with self._sem:
+                logger.info(f"Fetching page {page} from {self.config.name}: {url}")
+                content = await self.client.fetch_async(url, headers=self.config.headers, raw=True)
+                
+                if self.executor is None:
+                    return _parse_listing(content, self.config)
+                return await asyncio.get_running_loop().run_in_executor(
+                    self.executor, _parse_listing, content, self.config
+                )
             
         except Exception as e:
             logger.error(f"Error fetching page {page} from {self.config.name}: {str(e)}")
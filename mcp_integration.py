@@ -1,10 +1,12 @@
 import os
 import logging
-from dotenv import load_dotenv
 import requests
+from dataclasses import dataclass
+from typing import Optional
+from common import check_search_template, default_headers, load_env_once, pooled_session, render_search_url
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from .env file, once per process tree
+load_env_once()
 
 # Logger setup
 logger = logging.getLogger("mcp_integration")
@@ -21,18 +23,25 @@ if not all([BRIGHT_DATA_USERNAME, BRIGHT_DATA_PASSWORD]):
 else:
     logger.info("✅ Bright Data credentials loaded successfully.")
 
+# Shared proxy session, created on first use
+_SESSION = None
+
+def _get_session() -> requests.Session:
+    global _SESSION
+    if _SESSION is None:
+        proxy_url = f"http://{BRIGHT_DATA_USERNAME}:{BRIGHT_DATA_PASSWORD}@{BRIGHT_DATA_HOST}:{BRIGHT_DATA_PORT}"
+        _SESSION = pooled_session({
+            "http": proxy_url,
+            "https": proxy_url,
+        })
+    return _SESSION
+
 def make_request_with_proxy(target_url: str, headers=None, timeout=30) -> str:
     """
     Makes an HTTP GET request to the target URL using Bright Data's Web Unlocker proxy.
     """
-    proxy_url = f"http://{BRIGHT_DATA_USERNAME}:{BRIGHT_DATA_PASSWORD}@{BRIGHT_DATA_HOST}:{BRIGHT_DATA_PORT}"
-    proxies = {
-        "http": proxy_url,
-        "https": proxy_url,
-    }
-
     try:
-        response = requests.get(target_url, headers=headers, proxies=proxies, timeout=timeout)
+        response = _get_session().get(target_url, headers=headers, timeout=timeout)
         response.raise_for_status()
         return response.text
     except requests.exceptions.RequestException as e:
@@ -48,23 +57,24 @@ if __name__ == "__main__":
     except Exception as e:
         print("❌ Proxy request failed:", e)
 
+@dataclass(slots=True)
 class SourceConfig:
     """Configuration for a specific data source to crawl"""
-    def __init__(self, 
-                 name: str, 
-                 base_url: str, 
-                 search_url_template: str,
-                 listing_selector: str,
-                 detail_selectors: dict = None,
-                 headers: dict = None):
-        self.name = name
-        self.base_url = base_url
-        self.search_url_template = search_url_template
-        self.listing_selector = listing_selector
-        self.detail_selectors = detail_selectors or {}
-        self.headers = headers or {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
+    name: str
+    base_url: str
+    search_url_template: str
+    listing_selector: str
+    detail_selectors: Optional[dict] = None
+    headers: Optional[dict] = None
+
+    def __post_init__(self):
+        self.detail_selectors = self.detail_selectors or {}
+        self.headers = default_headers(self.headers)
+        check_search_template(self.search_url_template)
+    
+    def get_search_url(self, query, location=None, page=1):
+        """Fill the search URL template in a single pass"""
+        return render_search_url(self.base_url, self.search_url_template, query, location, page)
 
 
 class MCPClient:
@@ -86,16 +96,26 @@ class MCPClient:
             "http": self.proxy_url,
             "https": self.proxy_url
         }
+        
+        # Keep-alive session so repeated fetches reuse proxy connections
+        self.session = pooled_session(self.proxies)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def close(self):
+        """Close the pooled session"""
+        self.session.close()
     
     def fetch(self, url, headers=None):
         """Fetch content from a URL using proxy"""
-        import requests
-        
         try:
-            response = requests.get(
+            response = self.session.get(
                 url,
                 headers=headers,
-                proxies=self.proxies,
                 timeout=30
             )
             response.raise_for_status()
@@ -119,12 +139,7 @@ class MCPSourceCrawler:
         for page in range(1, max_pages + 1):
             try:
                 # Generate search URL for this page
-                url = self.config.search_url_template
-                url = url.replace("{query}", query)
-                if location and "{location}" in url:
-                    url = url.replace("{location}", location)
-                if "{page}" in url:
-                    url = url.replace("{page}", str(page))
+                url = self.config.get_search_url(query, location, page)
                 
                 # Fetch search results
                 print(f"Fetching page {page} from {self.config.name}: {url}")
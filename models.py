@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
 from database import Base
 from datetime import datetime
 
@@ -14,3 +14,7 @@ class Job(Base):
     description = Column(String)
     raw_data = Column(JSON)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_jobs_source_created_at", "source", "created_at"),
+    )
@@ -0,0 +1,47 @@
+"""
+Small in-process TTL cache for API responses that are expensive to recompute
+and safe to share between requests for a short window.
+"""
+
+import time
+from collections import OrderedDict
+from functools import wraps
+
+# Header sent alongside cached responses so proxies and browsers can reuse them too
+CACHE_CONTROL = "public, max-age=60"
+
+
+def ttl_cache(ttl: float = 60, maxsize: int = 1024):
+    """
+    Cache a function's results per argument tuple for `ttl` seconds
+
+    Lookups and stores happen without awaiting, so the cache is safe to use
+    from coroutines on a single event loop as well as from worker threads.
+    """
+    def decorator(func):
+        cache = OrderedDict()
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = args + tuple(sorted(kwargs.items()))
+            now = time.monotonic()
+            hit = cache.get(key)
+            if hit is not None and now - hit[0] < ttl:
+                return hit[1]
+
+            value = func(*args, **kwargs)
+            cache[key] = (now, value)
+            cache.move_to_end(key)
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+def normalize_skills(skills: str) -> str:
+    """Canonical form of a comma-separated skill list, so equivalent queries share a cache entry"""
+    return ",".join(sorted(s.strip().lower() for s in skills.split(",")))
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import BaseModel, ConfigDict, HttpUrl, Field
 from typing import List, Dict, Any, Optional
 
 
@@ -9,8 +9,10 @@ class SourceConfig(BaseModel):
     id: Optional[str] = None
     options: Optional[Dict[str, Any]] = Field(default_factory=dict)
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "source_type": "reddit",
                 "url": "https://www.reddit.com/r/artificial",
@@ -21,14 +23,17 @@ class SourceConfig(BaseModel):
                 }
             }
         }
+    )
 
 
 class CrawlRequest(BaseModel):
     sources: List[SourceConfig]
     task_name: str = "data_collection"
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "sources": [
                     {
@@ -44,6 +49,7 @@ class CrawlRequest(BaseModel):
                 "task_name": "data_collection"
             }
         }
+    )
 
 
 class CrawlResponse(BaseModel):
@@ -1,5 +1,5 @@
 import streamlit as st
-import requests
+import httpx
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -28,16 +28,25 @@ page = st.sidebar.selectbox("Choose Feature", [
     "Salary Trends"
 ])
 
+# One pooled HTTP/2 connection to the API, shared across reruns and sessions
+@st.cache_resource
+def get_http() -> httpx.Client:
+    return httpx.Client(base_url=API_BASE_URL, http2=True, timeout=30.0)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _get_json(endpoint, params=None):
+    # Raises on failure, so errors are never cached
+    response = get_http().get(f"/{endpoint}", params=params)
+    response.raise_for_status()
+    return response.json()
+
 def call_api(endpoint, params=None):
     """Call TrendHire API"""
     try:
-        url = f"{API_BASE_URL}/{endpoint}"
-        response = requests.get(url, params=params, timeout=30)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            st.error(f"API Error: {response.status_code}")
-            return None
+        return _get_json(endpoint, params)
+    except httpx.HTTPStatusError as e:
+        st.error(f"API Error: {e.response.status_code}")
+        return None
     except Exception as e:
         st.error(f"Connection Error: {str(e)}")
         return None
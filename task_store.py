@@ -0,0 +1,40 @@
+"""
+Crawl task state kept in Redis hashes so the API and crawl workers share it.
+"""
+
+from typing import Dict, Optional
+
+import orjson
+import redis.asyncio as redis
+
+# Task records expire from Redis after a day
+TASK_TTL_SECONDS = 86400
+
+
+def _task_key(task_id: str) -> str:
+    return f"task:{task_id}"
+
+
+async def save_task(r: redis.Redis, task_id: str, **fields):
+    """Write task fields to the task's Redis hash and refresh its expiry"""
+    async with r.pipeline(transaction=False) as pipe:
+        pipe.hset(_task_key(task_id), mapping={k: orjson.dumps(v) for k, v in fields.items()})
+        pipe.expire(_task_key(task_id), TASK_TTL_SECONDS)
+        await pipe.execute()
+
+
+async def save_tasks(r: redis.Redis, tasks: Dict[str, Dict]):
+    """Write several tasks' fields in a single round trip"""
+    async with r.pipeline(transaction=False) as pipe:
+        for task_id, fields in tasks.items():
+            pipe.hset(_task_key(task_id), mapping={k: orjson.dumps(v) for k, v in fields.items()})
+            pipe.expire(_task_key(task_id), TASK_TTL_SECONDS)
+        await pipe.execute()
+
+
+async def load_task(r: redis.Redis, task_id: str) -> Optional[Dict]:
+    """Read a task's fields, or None if the task is unknown or expired"""
+    raw = await r.hgetall(_task_key(task_id))
+    if not raw:
+        return None
+    return {k.decode(): orjson.loads(v) for k, v in raw.items()}
@@ -1,25 +1,56 @@
 # trendhire_api.py
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
+import uvloop
+uvloop.install()
+
+from fastapi import FastAPI, HTTPException, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 import asyncio
+from contextlib import asynccontextmanager
+import httpx
 import logging
+import orjson
+from arq import create_pool
+from arq.connections import RedisSettings
+from arq.constants import default_queue_name
 from datetime import datetime
+from uuid import uuid4
 import os
 
 # Import the MCP integration
-from mcp_integration import MCPClient, MCPSourceCrawler, SourceConfig, SourceType, AuthType
+from mcp_client_implementation import SourceConfig
+from task_store import save_task, save_tasks, load_task
+from response_cache import CACHE_CONTROL, ttl_cache, normalize_skills
+from log_queue import configure_logging
 
 # Setup logging
-logging.basicConfig(level=logging.INFO)
+log_listener = configure_logging(logging.INFO)
 logger = logging.getLogger("trendhire_api")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the application-wide clients on startup and close them on shutdown"""
+    # Restarts the listener if an earlier shutdown in this process stopped it
+    log_listener.start()
+    # Task state and the crawl queue live in Redis, shared with the crawl workers
+    app.state.redis = await create_pool(RedisSettings.from_dsn(REDIS_URL))
+    # Persistent client for the local Ollama server
+    app.state.ollama = httpx.AsyncClient(base_url=OLLAMA_URL, timeout=httpx.Timeout(120.0, connect=5.0))
+    yield
+    await app.state.ollama.aclose()
+    await app.state.redis.aclose()
+    log_listener.stop()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="TrendHire API",
     description="Discover the future of hiring—before it happens.",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -31,13 +62,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Bodies smaller than about one packet aren't worth compressing; SSE streams are left uncompressed
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Get API key from environment
 API_KEY = os.getenv("BRIGHT_DATA_API_KEY")
 if not API_KEY:
     logger.warning("BRIGHT_DATA_API_KEY not set in environment variables")
 
-# Active background jobs
-active_jobs = {}
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# New crawls are rejected once this many are waiting for a worker
+MAX_QUEUED_CRAWLS = int(os.getenv("MAX_QUEUED_CRAWLS", "1000"))
 
 # Models
 class TrendHireTask(BaseModel):
@@ -50,6 +88,12 @@ class TrendHireTask(BaseModel):
 class CrawlRequest(BaseModel):
     sources: List[SourceConfig]
     task_name: Optional[str] = "data_collection"
+    query: str = ""
+    location: Optional[str] = None
+    max_pages: int = 1
+
+class CrawlBatchRequest(BaseModel):
+    jobs: List[CrawlRequest]
 
 class TrendAnalysisRequest(BaseModel):
     job_title: Optional[str] = None
@@ -57,51 +101,84 @@ class TrendAnalysisRequest(BaseModel):
     location: Optional[str] = None
     time_range: Optional[str] = "last_30_days"
 
-# Dependency for MCP client
-async def get_mcp_client():
-    client = MCPClient(api_key=API_KEY)
-    try:
-        yield client
-    finally:
-        await client.client.aclose()
-
 # Endpoints
 @app.get("/")
 async def root():
     return {"message": "Welcome to TrendHire API - Discover the future of hiring before it happens"}
 
 @app.post("/crawl", response_model=TrendHireTask)
-async def start_crawl(request: CrawlRequest, background_tasks: BackgroundTasks):
+async def start_crawl(request: CrawlRequest):
     """Start a crawling task to collect data from specified sources"""
-    task_id = f"task_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    if await app.state.redis.zcard(default_queue_name) >= MAX_QUEUED_CRAWLS:
+        raise HTTPException(status_code=503, detail="Crawl queue is full, try again later")
     
-    active_jobs[task_id] = {
-        "task_id": task_id,
-        "status": "started",
-        "created_at": datetime.now(),
-        "completed_at": None,
-        "result_summary": None
-    }
+    task_id = uuid4().hex
+    created_at = datetime.now()
     
-    background_tasks.add_task(run_crawl_task, task_id, request.sources)
-    
-    return TrendHireTask(
+    await save_task(
+        app.state.redis,
+        task_id,
         task_id=task_id,
         status="started",
-        created_at=datetime.now()
+        created_at=created_at,
+        completed_at=None,
+        result_summary=None
+    )
+    
+    await app.state.redis.enqueue_job(
+        "run_crawl_task", task_id, request.sources, request.query, request.location, request.max_pages
     )
+    
+    # response_model validates the dict once; building a TrendHireTask here would validate it twice
+    return {"task_id": task_id, "status": "started", "created_at": created_at}
+
+@app.post("/crawl/batch", response_model=List[TrendHireTask])
+async def start_crawl_batch(request: CrawlBatchRequest):
+    """Start several crawling tasks in one request"""
+    queued = await app.state.redis.zcard(default_queue_name)
+    if queued + len(request.jobs) > MAX_QUEUED_CRAWLS:
+        raise HTTPException(status_code=503, detail="Crawl queue is full, try again later")
+    
+    task_ids = [uuid4().hex for _ in request.jobs]
+    created_at = datetime.now()
+    tasks = {
+        task_id: {
+            "task_id": task_id,
+            "status": "started",
+            "created_at": created_at,
+            "completed_at": None,
+            "result_summary": None
+        }
+        for task_id in task_ids
+    }
+    
+    await save_tasks(app.state.redis, tasks)
+    await asyncio.gather(*(
+        app.state.redis.enqueue_job(
+            "run_crawl_task", task_id, job.sources, job.query, job.location, job.max_pages
+        )
+        for task_id, job in zip(task_ids, request.jobs)
+    ))
+    
+    return list(tasks.values())
 
 @app.get("/tasks/{task_id}", response_model=TrendHireTask)
 async def get_task_status(task_id: str):
     """Get the status of a running or completed task"""
-    if task_id not in active_jobs:
+    task = await load_task(app.state.redis, task_id)
+    if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    return TrendHireTask(**active_jobs[task_id])
+    return task
 
 @app.get("/trends/velocity", response_model=Dict)
-async def get_trend_velocity(skill: Optional[str] = None, job_title: Optional[str] = None):
+async def get_trend_velocity(response: Response, skill: Optional[str] = None, job_title: Optional[str] = None):
     """Get the velocity index for skills or job titles"""
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return _trend_velocity(skill, job_title)
+
+@ttl_cache(ttl=60)
+def _trend_velocity(skill: Optional[str], job_title: Optional[str]) -> Dict:
     # Placeholder - would integrate with your trend analysis logic
     return {
         "trend_velocity": 0.85,
@@ -115,9 +192,14 @@ async def get_trend_velocity(skill: Optional[str] = None, job_title: Optional[st
     }
 
 @app.get("/skill-map")
-async def get_skill_opportunity_map(current_skills: str):
+async def get_skill_opportunity_map(current_skills: str, response: Response):
     """Map existing skills to trending job opportunities"""
-    skills_list = [s.strip() for s in current_skills.split(",")]
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return _skill_opportunity_map(normalize_skills(current_skills))
+
+@ttl_cache(ttl=60)
+def _skill_opportunity_map(skills: str) -> Dict:
+    skills_list = skills.split(",")
     
     # Placeholder - would integrate with your skill mapping logic
     return {
@@ -146,37 +228,38 @@ async def analyze_skill_gap(request: TrendAnalysisRequest):
         ]
     }
 
-# Background task function
-async def run_crawl_task(task_id: str, sources: List[SourceConfig]):
-    """Run the crawling task in the background"""
+@app.post("/analyze/gap/stream")
+async def stream_skill_gap_analysis(request: TrendAnalysisRequest):
+    """Stream LLM skill-gap advice as server-sent events"""
+    skills = ", ".join(request.skills or [])
+    # In-demand skills come from the skill-map placeholder until real trend data is wired in
+    market = _skill_opportunity_map(normalize_skills(skills))["skill_recommendations"]
+    market_skills = ", ".join(rec["skill"] for rec in market)
+    
+    # The upstream request is opened before the 200 goes out, so an unreachable or failing
+    # Ollama becomes a proper error status rather than an empty event stream
     try:
-        mcp_client = MCPClient(api_key=API_KEY)
-        crawler = MCPSourceCrawler(mcp_client)
-        
-        results = []
-        for source_config in sources:
-            result = await crawler.crawl_source(source_config)
-            results.append(result)
-        
-        # Update task status
-        active_jobs[task_id]["status"] = "completed"
-        active_jobs[task_id]["completed_at"] = datetime.now()
-        active_jobs[task_id]["result_summary"] = {
-            "sources_processed": len(results),
-            "successful_crawls": sum(1 for r in results if "error" not in r),
-            "failed_crawls": sum(1 for r in results if "error" in r),
-        }
-        
-        # Here you would typically store the results in a database
-        # and trigger any analysis or processing jobs
-        logger.info(f"Task {task_id} completed successfully")
-        
-    except Exception as e:
-        logger.error(f"Task {task_id} failed: {str(e)}")
-        active_jobs[task_id]["status"] = "failed"
-        active_jobs[task_id]["result_summary"] = {"error": str(e)}
-    finally:
-        await mcp_client.client.aclose()
+        res = await open_skill_gap_stream(app.state.ollama, skills, market_skills)
+    except httpx.HTTPError as e:
+        logger.warning("Ollama unavailable: %s", e)
+        raise HTTPException(status_code=503, detail="LLM service unavailable")
+    if res.is_error:
+        await res.aclose()
+        logger.warning("Ollama returned HTTP %d", res.status_code)
+        raise HTTPException(status_code=502, detail="LLM service returned an error")
+    
+    async def events():
+        try:
+            async for token in iter_skill_gap_tokens(res):
+                yield f"data: {orjson.dumps(token).decode()}\n\n"
+        except httpx.HTTPError as e:
+            # Headers are already sent, so a failure mid-stream is reported in-band
+            logger.warning("Ollama stream failed: %s", e)
+            yield f"event: error\ndata: {orjson.dumps('LLM stream interrupted').decode()}\n\n"
+        finally:
+            await res.aclose()
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 # Main function to run the API with uvicorn
 if __name__ == "__main__":
@@ -197,46 +280,121 @@ class JobTrend(Base):
 
 import faiss
 import numpy as np
+from typing import Literal
+
+# 8-bit PQ codebooks have 256 centroids per sub-quantizer, so need at least that many training points
+PQ_MIN_TRAINING = 256
+
+def build_faiss_index(embeddings: list[np.ndarray], quantize: Literal["none", "sq8", "pq"] = "none"):
+    """
+    Build an approximate nearest-neighbour index over skill embeddings.
 
-def build_faiss_index(embeddings: list[np.ndarray]):
-    dim = embeddings[0].shape[0]
-    index = faiss.IndexFlatL2(dim)
-    index.add(np.array(embeddings))
+    quantize picks the storage/recall trade-off:
+      - "none": HNSW over full float32 vectors, best recall
+      - "sq8":  HNSW over 8-bit scalar-quantized vectors, 4x less memory, small recall loss
+      - "pq":   IVF with product quantization (48 bytes/vector), smallest and fastest, lowest recall
+    Queries stay float32 and are quantized internally. "pq" needs at least
+    PQ_MIN_TRAINING vectors to train its codebooks; smaller corpora fall back to "sq8".
+    """
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    dim = vectors.shape[1]
+    # Training only needs a representative sample
+    sample = vectors[:10_000]
+    if quantize == "pq" and len(sample) < PQ_MIN_TRAINING:
+        quantize = "sq8"
+    if quantize == "pq":
+        # Keep ~39 training points per list, as FAISS recommends
+        nlist = max(1, len(sample) // 39)
+        quantizer = faiss.IndexFlatL2(dim)
+        index = faiss.IndexIVFPQ(quantizer, dim, nlist, 48, 8)
+        index.train(sample)
+        # Probing one list (the FAISS default) misses most neighbours near list boundaries
+        index.nprobe = min(16, nlist)
+    else:
+        if quantize == "sq8":
+            index = faiss.IndexHNSWSQ(dim, faiss.ScalarQuantizer.QT_8bit, 32)
+            index.train(sample)
+        else:
+            index = faiss.IndexHNSWFlat(dim, 32)
+        index.hnsw.efConstruction = 200
+        index.hnsw.efSearch = 64
+    index.add(vectors)
     return index
 
 def search_similar_skills(index, query_embedding, top_k=5):
-    D, I = index.search(np.array([query_embedding]), top_k)
+    D, I = index.search(np.asarray([query_embedding], dtype=np.float32), top_k)
     return I
 
-import requests
-
-def analyze_skill_gap(profile_skills, market_skills):
+async def open_skill_gap_stream(client: httpx.AsyncClient, profile_skills, market_skills) -> httpx.Response:
+    """Start a streaming Ollama completion; the caller checks the status and must close the response"""
     prompt = f"""
     A user knows these skills: {profile_skills}.
     Based on the market demand: {market_skills}.
     What skills should they learn next to stay ahead?
     """
-    res = requests.post("http://localhost:11434/api/generate", json={
+    request = client.build_request("POST", "/api/generate", json={
         "model": "mistral",
         "prompt": prompt,
-        "stream": False
+        "stream": True
     })
-    return res.json()['response']
+    return await client.send(request, stream=True)
+
+async def iter_skill_gap_tokens(res: httpx.Response):
+    """Yield the model's advice token by token as Ollama produces it"""
+    async for line in res.aiter_lines():
+        if not line:
+            continue
+        chunk = orjson.loads(line)
+        yield chunk.get("response", "")
+        if chunk.get("done"):
+            break
 
 from sentence_transformers import SentenceTransformer
 import faiss
 import numpy as np
 
 model = SentenceTransformer('all-MiniLM-L6-v2')
-index = faiss.IndexFlatL2(384)  # Vector size for the above model
-id_map = []
+# Embeddings are L2-normalised, so inner product is cosine similarity
+_hnsw = faiss.IndexHNSWFlat(384, 32, faiss.METRIC_INNER_PRODUCT)  # Vector size for the above model
+_hnsw.hnsw.efConstruction = 200
+_hnsw.hnsw.efSearch = 64
+# FAISS keeps the int64 ids itself, so no Python-side id list is needed
+index = faiss.IndexIDMap2(_hnsw)
+
+# Texts are buffered and encoded/added to the index in batches
+ADD_BATCH_SIZE = 256
+_pending_texts = []
+_pending_ids = []
+
+def _encode(texts: list[str]) -> np.ndarray:
+    return model.encode(
+        texts,
+        batch_size=128,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False
+    ).astype(np.float32, copy=False)
+
+def _flush_pending():
+    if _pending_texts:
+        add_many_to_index(_pending_texts, _pending_ids)
+        _pending_texts.clear()
+        _pending_ids.clear()
+
+def add_many_to_index(texts: list[str], ids: list[int]):
+    index.add_with_ids(_encode(texts), np.asarray(ids, dtype=np.int64))
+
+def add_to_index(text, id: int):
+    _pending_texts.append(text)
+    _pending_ids.append(id)
+    if len(_pending_texts) >= ADD_BATCH_SIZE:
+        _flush_pending()
 
-def add_to_index(text, id):
-    vector = model.encode([text])
-    index.add(np.array(vector).astype("float32"))
-    id_map.append(id)
+def search_many(queries: list[str], top_k=5) -> list[list[int]]:
+    _flush_pending()
+    D, I = index.search(_encode(queries), top_k)
+    # HNSW pads with -1 when fewer than top_k vectors are indexed
+    return [row[row >= 0].tolist() for row in I]
 
 def search(query, top_k=5):
-    vector = model.encode([query])
-    D, I = index.search(np.array(vector).astype("float32"), top_k)
-    return [id_map[i] for i in I[0]]
+    return search_many([query], top_k)[0]
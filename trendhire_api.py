@@ -1,54 +1,165 @@
-from fastapi import FastAPI
+import uvloop
+uvloop.install()
+
+from fastapi import FastAPI, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import logging
+import os
+import orjson
+import re
 import sentry_sdk
+from sentry_sdk.integrations.fastapi import FastApiIntegration
+from sentry_sdk.integrations.starlette import StarletteIntegration
+from database import DATABASE_URL
+from response_cache import CACHE_CONTROL, ttl_cache
+from log_queue import configure_logging
+from common import load_env_once
+
+load_env_once()
+
+log_listener = configure_logging(logging.INFO)
+logger = logging.getLogger("trendhire_api")
+
+_DEFAULT_SENTRY_DSN = "https://1f8c5a2d1770a4e90c63d422050a455b@o4509340733669376.ingest.us.sentry.io/4509340752478213"
+
+# Variables the API can start without but should warn about
+_REQUIRED = frozenset({"BRIGHT_DATA_API_KEY"})
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    bright_data_api_key: Optional[str]
+    sentry_dsn: Optional[str]
+    sentry_traces_sample_rate: float
+    database_url: str
+    port: int
+    _db_info: Dict[str, Optional[str]] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # Parsed once here rather than on every lookup
+        parsed = urlparse(self.database_url)
+        object.__setattr__(self, "_db_info", {
+            "host": parsed.hostname,
+            "db_name": parsed.path.lstrip("/")
+        })
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        # Scan the environment once and derive everything from that snapshot
+        env = os.environ
+        _validate_config(env)
+        return cls(
+            bright_data_api_key=env.get("BRIGHT_DATA_API_KEY"),
+            sentry_dsn=env.get("SENTRY_DSN", _DEFAULT_SENTRY_DSN),
+            sentry_traces_sample_rate=float(env.get("SENTRY_TRACES_SAMPLE_RATE", 0.01)),
+            database_url=env.get("DATABASE_URL", DATABASE_URL),
+            port=int(env.get("PORT", 8000))
+        )
+
+    def get_db_connection_params(self) -> Dict[str, Optional[str]]:
+        """Host and database name from DATABASE_URL, without credentials"""
+        return self._db_info
+
+def _validate_config(env) -> None:
+    # Set-but-empty variables count as missing
+    missing = _REQUIRED - {key for key in _REQUIRED if env.get(key)}
+    if missing:
+        logger.warning("Missing environment variables: %s", ", ".join(sorted(missing)))
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings.from_env()
 
-sentry_sdk.init(
-    dsn="https://1f8c5a2d1770a4e90c63d422050a455b@o4509340733669376.ingest.us.sentry.io/4509340752478213",
-    # Add data like request headers and IP for users,
-    # see https://docs.sentry.io/platforms/python/data-management/data-collected/ for more info
-    send_default_pii=True,
-)
+settings = get_settings()
 
-app = FastAPI()
+if settings.sentry_dsn:
+    sentry_sdk.init(
+        dsn=settings.sentry_dsn,
+        # Request headers, cookies and IPs are not attached to events
+        send_default_pii=False,
+        traces_sample_rate=settings.sentry_traces_sample_rate,
+        integrations=[
+            StarletteIntegration(transaction_style="endpoint"),
+            FastApiIntegration(transaction_style="endpoint"),
+        ],
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Restarts the listener if an earlier shutdown in this process stopped it
+    log_listener.start()
+    yield
+    log_listener.stop()
+
+app = FastAPI(title="TrendHire API", version="1.0.0", default_response_class=ORJSONResponse, lifespan=lifespan)
+
+# Bodies smaller than about one packet aren't worth compressing
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 @app.get("/sentry-debug")
 async def trigger_error():
     division_by_zero = 1 / 0
 
-from fastapi import FastAPI
-import os
+# These payloads only depend on settings, which are fixed for the life of the process
+_ROOT_BYTES = orjson.dumps({"message": "TrendHire API is running!", "status": "success"})
+_HEALTH_BYTES = orjson.dumps({"status": "healthy", "bright_data_configured": bool(settings.bright_data_api_key)})
+
+@app.get("/", response_model=None)
+async def root():
+    return Response(content=_ROOT_BYTES, media_type="application/json")
+
+@app.get("/health", response_model=None)
+async def health_check():
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
+
+# Mock data for demo, serialized once since it never changes
+_TRENDING_JOBS_BYTES = orjson.dumps({
+    "trending_jobs": [
+        {"title": "AI Safety Engineer", "growth": 340, "avg_salary": 185000, "demand": "Very High"},
+        {"title": "Prompt Engineer", "growth": 280, "avg_salary": 145000, "demand": "High"},
+        {"title": "MLOps Engineer", "growth": 220, "avg_salary": 155000, "demand": "High"},
+        {"title": "Climate Data Scientist", "growth": 190, "avg_salary": 135000, "demand": "Medium"},
+        {"title": "Quantum Software Developer", "growth": 150, "avg_salary": 165000, "demand": "Medium"}
+    ]
+})
+
+@app.get("/trending-jobs", response_model=None)
+async def get_trending_jobs():
+    return Response(
+        content=_TRENDING_JOBS_BYTES,
+        media_type="application/json",
+        headers={"Cache-Control": CACHE_CONTROL}
+    )
+
+@app.get("/skills-analysis/{skills}", response_model=None)
+async def analyze_skills(skills: str):
+    return Response(
+        content=_analyze_skills(skills),
+        media_type="application/json",
+        headers={"Cache-Control": CACHE_CONTROL}
+    )
+
+_SPLIT_RE = re.compile(r"\s*,\s*")
+
+# Mock data for demo
+_TRENDING_SKILLS = ("LangChain", "Vector Databases", "MLOps", "Kubernetes", "Rust")
+_RECOMMENDATIONS = tuple(f"Learn {skill} to increase marketability" for skill in ("LangChain", "MLOps"))
 
-app = FastAPI(title="TrendHire API", version="1.0.0")
-
-@app.get("/")
-def root():
-    return {"message": "TrendHire API is running!", "status": "success"}
-
-@app.get("/health")
-def health_check():
-    return {"status": "healthy", "bright_data_configured": bool(os.getenv("BRIGHT_DATA_API_KEY"))}
-
-@app.get("/trending-jobs")
-def get_trending_jobs():
-    # Mock data for demo
-    return {
-        "trending_jobs": [
-            {"title": "AI Safety Engineer", "growth": 340, "avg_salary": 185000, "demand": "Very High"},
-            {"title": "Prompt Engineer", "growth": 280, "avg_salary": 145000, "demand": "High"},
-            {"title": "MLOps Engineer", "growth": 220, "avg_salary": 155000, "demand": "High"},
-            {"title": "Climate Data Scientist", "growth": 190, "avg_salary": 135000, "demand": "Medium"},
-            {"title": "Quantum Software Developer", "growth": 150, "avg_salary": 165000, "demand": "Medium"}
-        ]
-    }
-
-@app.get("/skills-analysis/{skills}")
-def analyze_skills(skills: str):
-    skill_list = [s.strip() for s in skills.split(",")]
-    return {
+@ttl_cache(ttl=60)
+def _analyze_skills(skills: str) -> bytes:
+    # Cached pre-serialized, so repeat queries skip encoding entirely
+    skill_list = _SPLIT_RE.split(skills.strip())
+    return orjson.dumps({
         "current_skills": skill_list,
-        "trending_skills": ["LangChain", "Vector Databases", "MLOps", "Kubernetes", "Rust"],
-        "recommendations": [f"Learn {skill} to increase marketability" for skill in ["LangChain", "MLOps"]]
-    }
+        "trending_skills": _TRENDING_SKILLS,
+        "recommendations": _RECOMMENDATIONS
+    })
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", 8000)))
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=settings.port, loop="uvloop", http="httptools")
\ No newline at end of file
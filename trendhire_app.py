@@ -1,16 +1,230 @@
 # trendhire_app.py
 import streamlit as st
-import requests
+import httpx
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import json
 from datetime import datetime, timedelta
-import time
 
 # API endpoint (change in production)
 API_ENDPOINT = "http://localhost:8000"
 
+# One pooled HTTP/2 connection to the API, shared across reruns and sessions
+@st.cache_resource
+def get_http() -> httpx.Client:
+    return httpx.Client(base_url=API_ENDPOINT, http2=True, timeout=5.0)
+
+# API responses are cached per arguments, so widget-triggered reruns don't refetch them.
+# Errors are raised rather than returned, which keeps failures out of the cache.
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_trend_velocity(skill: str) -> dict:
+    response = get_http().get("/trends/velocity", params={"skill": skill})
+    response.raise_for_status()
+    return response.json()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_skill_map(current_skills: str) -> dict:
+    response = get_http().get("/skill-map", params={"current_skills": current_skills})
+    response.raise_for_status()
+    return response.json()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_skill_gap(time_range: str) -> dict:
+    response = get_http().post("/analyze/gap", json={"time_range": time_range})
+    response.raise_for_status()
+    return response.json()
+
+def with_fallback(fetch, *args) -> dict:
+    """Call a fetch_* helper, returning {} if the API is unreachable so pages fall back to sample data"""
+    try:
+        return fetch(*args)
+    except (httpx.HTTPError, ValueError):
+        return {}
+
+# Sample data (would come from the API). Streamlit re-executes this script on every
+# rerun, so the literals are built once here and served from the cache afterwards;
+# cache_data hands each caller its own copy, so pages may update them freely.
+@st.cache_data(show_spinner=False)
+def mock_dashboard_skills() -> pd.DataFrame:
+    return pd.DataFrame({
+        "Skill": ["RAG Development", "LangChain", "FAISS", "Prompt Engineering", "Vector Databases"],
+        "Velocity": [0.92, 0.87, 0.82, 0.78, 0.73],
+        "Category": ["AI/ML", "AI/ML", "AI/ML", "AI/ML", "Data Science"]
+    })
+
+@st.cache_data(show_spinner=False)
+def mock_dashboard_roles() -> pd.DataFrame:
+    return pd.DataFrame({
+        "Role": ["RAG Engineer", "AI Product Manager", "LLM Fine-tuner", "Prompt Engineer", "MLOps Specialist"],
+        "Growth": [145, 112, 95, 87, 72]
+    })
+
+@st.cache_data(show_spinner=False)
+def mock_dashboard_gap() -> pd.DataFrame:
+    return pd.DataFrame({
+        "Skill": ["Vector DBs", "LLM Fine-tuning", "RAG", "Multimodal AI", "AI Ethics"],
+        "Market Demand": [0.89, 0.82, 0.93, 0.76, 0.68],
+        "Education Coverage": [0.45, 0.52, 0.38, 0.41, 0.72]
+    })
+
+@st.cache_data(show_spinner=False)
+def mock_trend_velocity() -> dict:
+    return {
+        "trend_velocity": 0.85,
+        "change_30d": "+15%",
+        "source_breakdown": {
+            "job_boards": 0.78,
+            "reddit": 0.92,
+            "tech_forums": 0.88,
+            "learning_platforms": 0.81
+        },
+        "historical": [
+            {"date": "2025-04-15", "value": 0.72},
+            {"date": "2025-04-22", "value": 0.75},
+            {"date": "2025-04-29", "value": 0.78},
+            {"date": "2025-05-06", "value": 0.81},
+            {"date": "2025-05-13", "value": 0.85}
+        ]
+    }
+
+@st.cache_data(show_spinner=False)
+def mock_trending_skills() -> pd.DataFrame:
+    return pd.DataFrame({
+        "Skill": ["RAG", "LangChain", "Vector Databases", "LLM Fine-tuning", "Multimodal AI"],
+        "Trend Velocity": [0.92, 0.87, 0.85, 0.82, 0.78],
+        "30-Day Change": ["+22%", "+15%", "+18%", "+9%", "+12%"]
+    })
+
+@st.cache_data(show_spinner=False)
+def mock_skill_map() -> dict:
+    return {
+        "matching_roles": [
+            {"title": "RAG Engineer", "match_score": 0.75, "missing_skills": ["LangChain", "Vector DBs"]},
+            {"title": "ML Engineer", "match_score": 0.82, "missing_skills": ["MLOps", "Kubernetes"]},
+            {"title": "Data Scientist", "match_score": 0.88, "missing_skills": ["Tableau", "A/B Testing"]},
+            {"title": "AI Developer", "match_score": 0.70, "missing_skills": ["React", "FastAPI", "OAuth"]}
+        ],
+        "skill_recommendations": [
+            {"skill": "LangChain", "demand_score": 0.91, "learning_difficulty": "Medium"},
+            {"skill": "Vector Databases", "demand_score": 0.89, "learning_difficulty": "Medium"},
+            {"skill": "MLOps", "demand_score": 0.87, "learning_difficulty": "Hard"},
+            {"skill": "Kubernetes", "demand_score": 0.85, "learning_difficulty": "Hard"},
+            {"skill": "React", "demand_score": 0.82, "learning_difficulty": "Medium"}
+        ]
+    }
+
+@st.cache_data(show_spinner=False)
+def mock_skill_gap() -> dict:
+    return {
+        "market_needs_score": 0.92,
+        "education_coverage_score": 0.67,
+        "gap_score": 0.25,
+        "skill_gaps": [
+            {"skill": "RAG Implementation", "market_demand": 0.95, "education_coverage": 0.45, "gap_score": 0.50},
+            {"skill": "Vector Database Management", "market_demand": 0.88, "education_coverage": 0.40, "gap_score": 0.48},
+            {"skill": "LLM Fine-tuning", "market_demand": 0.85, "education_coverage": 0.55, "gap_score": 0.30},
+            {"skill": "Multimodal LLMs", "market_demand": 0.82, "education_coverage": 0.35, "gap_score": 0.47},
+            {"skill": "Efficient Prompt Engineering", "market_demand": 0.80, "education_coverage": 0.60, "gap_score": 0.20}
+        ],
+        "recommendations": [
+            "More courses needed on RAG implementation",
+            "Additional content on multimodal LLMs required",
+            "Practical projects in vector database management underrepresented",
+            "Hands-on exercises for LLM fine-tuning needed",
+            "Better integration of prompt engineering with real business cases"
+        ]
+    }
+
+@st.cache_data(show_spinner=False)
+def mock_salary() -> dict:
+    return {
+        "by_location": {
+            "San Francisco": {"mean": 152000, "median": 145000, "growth": "+5.2%"},
+            "New York": {"mean": 145000, "median": 140000, "growth": "+4.8%"},
+            "Remote": {"mean": 135000, "median": 130000, "growth": "+8.5%"},
+            "Seattle": {"mean": 148000, "median": 142000, "growth": "+3.9%"},
+            "Austin": {"mean": 138000, "median": 132000, "growth": "+7.2%"}
+        },
+        "by_title": {
+            "AI Engineer": {"mean": 145000, "median": 140000, "growth": "+6.3%"},
+            "ML Engineer": {"mean": 152000, "median": 148000, "growth": "+5.5%"},
+            "RAG Engineer": {"mean": 160000, "median": 155000, "growth": "+12.8%"},
+            "Data Scientist": {"mean": 138000, "median": 132000, "growth": "+4.2%"},
+            "AI Product Manager": {"mean": 155000, "median": 148000, "growth": "+7.5%"}
+        },
+        "time_trends": [
+            {"month": "2024-11", "mean_salary": 135000, "percent_change": 0},
+            {"month": "2024-12", "mean_salary": 138500, "percent_change": 2.6},
+            {"month": "2025-01", "mean_salary": 142000, "percent_change": 2.5},
+            {"month": "2025-02", "mean_salary": 146500, "percent_change": 3.2},
+            {"month": "2025-03", "mean_salary": 150000, "percent_change": 2.4},
+            {"month": "2025-04", "mean_salary": 155000, "percent_change": 3.3}
+        ]
+    }
+
+# Figures are cached keyed by their input data, so reruns that don't change it skip building
+# and validating them; st.plotly_chart still serializes the figure on every rerun.
+# cache_resource hands out the shared object, which callers must treat as read-only.
+@st.cache_resource(show_spinner=False)
+def build_gap_chart(gap_df: pd.DataFrame, title: str) -> go.Figure:
+    long_df = gap_df.melt(
+        id_vars="Skill",
+        value_vars=["Market Demand", "Education Coverage"],
+        var_name="Measure",
+        value_name="Score"
+    )
+    fig = px.bar(
+        long_df,
+        x="Skill",
+        y="Score",
+        color="Measure",
+        barmode="group",
+        title=title,
+        color_discrete_map={
+            "Market Demand": "rgb(55, 83, 109)",
+            "Education Coverage": "rgb(26, 118, 255)"
+        }
+    )
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def build_history_chart(history: tuple, search_term: str) -> go.Figure:
+    hist_df = pd.DataFrame(list(history), columns=["date", "value"])
+    hist_df["date"] = pd.to_datetime(hist_df["date"])
+    fig = px.line(
+        hist_df,
+        x="date",
+        y="value",
+        title=f"Trend Velocity for '{search_term}' Over Time",
+        labels={"value": "Velocity Score", "date": "Date"},
+        # WebGL (scattergl) keeps dense time series off the browser's SVG DOM
+        render_mode="webgl"
+    )
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def build_salary_time_chart(trends: tuple) -> go.Figure:
+    time_df = pd.DataFrame(list(trends), columns=["month", "mean_salary", "percent_change"])
+    time_df["month"] = pd.to_datetime(time_df["month"])
+    fig = px.line(
+        time_df,
+        x="month",
+        y="mean_salary",
+        title="Salary Trends Over Time",
+        labels={"mean_salary": "Mean Salary", "month": "Month"},
+        render_mode="webgl"
+    )
+    # Add percent change as annotations in one layout update, skipping the first month (no change)
+    fig.update_layout(annotations=[
+        dict(x=row.month, y=row.mean_salary, text=f"+{row.percent_change}%", showarrow=True, arrowhead=7, ax=0, ay=-40)
+        for row in time_df.iloc[1:].itertuples()
+    ])
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def build_bar_chart(df: pd.DataFrame, **kwargs) -> go.Figure:
+    return px.bar(df, **kwargs)
+
 # Page title and configuration
 st.set_page_config(
     page_title="TrendHire: Discover the future of hiring—before it happens",
@@ -97,14 +311,9 @@ if page == "Dashboard":
     st.subheader("Top Trending Skills")
     
     # Sample data (would come from API)
-    skills_data = {
-        "Skill": ["RAG Development", "LangChain", "FAISS", "Prompt Engineering", "Vector Databases"],
-        "Velocity": [0.92, 0.87, 0.82, 0.78, 0.73],
-        "Category": ["AI/ML", "AI/ML", "AI/ML", "AI/ML", "Data Science"]
-    }
-    df_skills = pd.DataFrame(skills_data)
+    df_skills = mock_dashboard_skills()
     
-    fig_skills = px.bar(
+    fig_skills = build_bar_chart(
         df_skills, 
         x="Skill", 
         y="Velocity", 
@@ -119,13 +328,9 @@ if page == "Dashboard":
     
     with col1:
         st.subheader("Emerging Job Roles")
-        roles_data = {
-            "Role": ["RAG Engineer", "AI Product Manager", "LLM Fine-tuner", "Prompt Engineer", "MLOps Specialist"],
-            "Growth": [145, 112, 95, 87, 72]
-        }
-        df_roles = pd.DataFrame(roles_data)
+        df_roles = mock_dashboard_roles()
         
-        fig_roles = px.bar(
+        fig_roles = build_bar_chart(
             df_roles, 
             x="Role", 
             y="Growth",
@@ -137,32 +342,9 @@ if page == "Dashboard":
     
     with col2:
         st.subheader("Skill to Education Gap")
-        gap_data = {
-            "Skill": ["Vector DBs", "LLM Fine-tuning", "RAG", "Multimodal AI", "AI Ethics"],
-            "Market Demand": [0.89, 0.82, 0.93, 0.76, 0.68],
-            "Education Coverage": [0.45, 0.52, 0.38, 0.41, 0.72]
-        }
-        df_gap = pd.DataFrame(gap_data)
-        
-        fig_gap = go.Figure()
-        fig_gap.add_trace(go.Bar(
-            x=df_gap["Skill"],
-            y=df_gap["Market Demand"],
-            name="Market Demand",
-            marker_color="rgb(55, 83, 109)"
-        ))
-        fig_gap.add_trace(go.Bar(
-            x=df_gap["Skill"],
-            y=df_gap["Education Coverage"],
-            name="Education Coverage",
-            marker_color="rgb(26, 118, 255)"
-        ))
-        
-        fig_gap.update_layout(
-            title="Market Demand vs. Education Coverage",
-            barmode="group"
-        )
+        df_gap = mock_dashboard_gap()
         
+        fig_gap = build_gap_chart(df_gap, "Market Demand vs. Education Coverage")
         st.plotly_chart(fig_gap, use_container_width=True)
 
 # Trend Velocity Page
@@ -173,28 +355,9 @@ elif page == "Trend Velocity":
     search_term = st.text_input("Search for a skill or job title")
     
     if search_term:
-        # Sample API call to get trend velocity (mocked for now)
-        # response = requests.get(f"{API_ENDPOINT}/trends/velocity?skill={search_term}")
-        # trend_data = response.json()
-        
-        # Mock data
-        trend_data = {
-            "trend_velocity": 0.85,
-            "change_30d": "+15%",
-            "source_breakdown": {
-                "job_boards": 0.78,
-                "reddit": 0.92,
-                "tech_forums": 0.88,
-                "learning_platforms": 0.81
-            },
-            "historical": [
-                {"date": "2025-04-15", "value": 0.72},
-                {"date": "2025-04-22", "value": 0.75},
-                {"date": "2025-04-29", "value": 0.78},
-                {"date": "2025-05-06", "value": 0.81},
-                {"date": "2025-05-13", "value": 0.85}
-            ]
-        }
+        # Sample data, used for anything the API doesn't return (e.g. history)
+        trend_data = mock_trend_velocity()
+        trend_data.update(with_fallback(fetch_trend_velocity, search_term))
         
         # Display main metric
         st.metric(
@@ -222,16 +385,8 @@ elif page == "Trend Velocity":
         
         # Historical trend chart
         st.subheader("Historical Trend")
-        hist_df = pd.DataFrame(trend_data["historical"])
-        hist_df["date"] = pd.to_datetime(hist_df["date"])
-        
-        fig_hist = px.line(
-            hist_df,
-            x="date",
-            y="value",
-            title=f"Trend Velocity for '{search_term}' Over Time",
-            labels={"value": "Velocity Score", "date": "Date"}
-        )
+        history = tuple((point["date"], point["value"]) for point in trend_data["historical"])
+        fig_hist = build_history_chart(history, search_term)
         st.plotly_chart(fig_hist, use_container_width=True)
         
         # Related trends
@@ -241,25 +396,19 @@ elif page == "Trend Velocity":
         with col1:
             st.markdown("### Related Skills")
             related_skills = ["Vector Embeddings", "Semantic Search", "Langchain", "Chroma DB", "HuggingFace"]
-            for skill in related_skills:
-                st.markdown(f"- {skill} (0.{int(70 + 5*related_skills.index(skill))})")
+            for i, skill in enumerate(related_skills):
+                st.markdown(f"- {skill} (0.{70 + 5*i})")
         
         with col2:
             st.markdown("### Related Job Roles")
             related_roles = ["RAG Engineer", "ML Engineer", "Data Scientist", "AI Developer", "LLM Specialist"]
-            for role in related_roles:
-                st.markdown(f"- {role} (0.{int(80 - 3*related_roles.index(role))})")
+            for i, role in enumerate(related_roles):
+                st.markdown(f"- {role} (0.{80 - 3*i})")
     
     else:
         # Sample trending skills table
         st.subheader("Top Trending Skills Right Now")
-        trending_data = {
-            "Skill": ["RAG", "LangChain", "Vector Databases", "LLM Fine-tuning", "Multimodal AI"],
-            "Trend Velocity": [0.92, 0.87, 0.85, 0.82, 0.78],
-            "30-Day Change": ["+22%", "+15%", "+18%", "+9%", "+12%"]
-        }
-        
-        st.dataframe(pd.DataFrame(trending_data), hide_index=True)
+        st.dataframe(mock_trending_skills(), hide_index=True)
 
 # Skill Mapper Page
 elif page == "Skill Mapper":
@@ -274,25 +423,9 @@ elif page == "Skill Mapper":
     
     if st.button("Analyze My Skills"):
         with st.spinner("Analyzing skills..."):
-            # Simulate API call
-            time.sleep(2)
-            
-            # Sample data (would come from API)
-            skill_map_data = {
-                "matching_roles": [
-                    {"title": "RAG Engineer", "match_score": 0.75, "missing_skills": ["LangChain", "Vector DBs"]},
-                    {"title": "ML Engineer", "match_score": 0.82, "missing_skills": ["MLOps", "Kubernetes"]},
-                    {"title": "Data Scientist", "match_score": 0.88, "missing_skills": ["Tableau", "A/B Testing"]},
-                    {"title": "AI Developer", "match_score": 0.70, "missing_skills": ["React", "FastAPI", "OAuth"]}
-                ],
-                "skill_recommendations": [
-                    {"skill": "LangChain", "demand_score": 0.91, "learning_difficulty": "Medium"},
-                    {"skill": "Vector Databases", "demand_score": 0.89, "learning_difficulty": "Medium"},
-                    {"skill": "MLOps", "demand_score": 0.87, "learning_difficulty": "Hard"},
-                    {"skill": "Kubernetes", "demand_score": 0.85, "learning_difficulty": "Hard"},
-                    {"skill": "React", "demand_score": 0.82, "learning_difficulty": "Medium"}
-                ]
-            }
+            # Sample data, replaced by the API's response when it is reachable
+            skill_map_data = mock_skill_map()
+            skill_map_data.update(with_fallback(fetch_skill_map, user_skills))
             
             # Display matching roles
             st.subheader("Your Matching Job Opportunities")
@@ -312,14 +445,11 @@ elif page == "Skill Mapper":
             # Display skill recommendations
             st.subheader("Recommended Skills to Learn")
             
-            rec_data = pd.DataFrame([
-                {
-                    "Skill": rec["skill"],
-                    "Demand Score": rec["demand_score"],
-                    "Learning Difficulty": rec["learning_difficulty"]
-                }
-                for rec in skill_map_data["skill_recommendations"]
-            ])
+            rec_data = pd.DataFrame(skill_map_data["skill_recommendations"]).rename(columns={
+                "skill": "Skill",
+                "demand_score": "Demand Score",
+                "learning_difficulty": "Learning Difficulty"
+            })
             
             fig = px.bar(
                 rec_data,
@@ -352,29 +482,9 @@ elif page == "Gap Analyzer":
     
     if analyze_button:
         with st.spinner("Running analysis..."):
-            # Simulate API call
-            time.sleep(2)
-            
-            # Sample data
-            gap_data = {
-                "market_needs_score": 0.92,
-                "education_coverage_score": 0.67,
-                "gap_score": 0.25,
-                "skill_gaps": [
-                    {"skill": "RAG Implementation", "market_demand": 0.95, "education_coverage": 0.45, "gap_score": 0.50},
-                    {"skill": "Vector Database Management", "market_demand": 0.88, "education_coverage": 0.40, "gap_score": 0.48},
-                    {"skill": "LLM Fine-tuning", "market_demand": 0.85, "education_coverage": 0.55, "gap_score": 0.30},
-                    {"skill": "Multimodal LLMs", "market_demand": 0.82, "education_coverage": 0.35, "gap_score": 0.47},
-                    {"skill": "Efficient Prompt Engineering", "market_demand": 0.80, "education_coverage": 0.60, "gap_score": 0.20}
-                ],
-                "recommendations": [
-                    "More courses needed on RAG implementation",
-                    "Additional content on multimodal LLMs required",
-                    "Practical projects in vector database management underrepresented",
-                    "Hands-on exercises for LLM fine-tuning needed",
-                    "Better integration of prompt engineering with real business cases"
-                ]
-            }
+            # Sample data, used for anything the API doesn't return (e.g. per-skill gaps)
+            gap_data = mock_skill_gap()
+            gap_data.update(with_fallback(fetch_skill_gap, time_range.lower().replace(" ", "_")))
             
             # Display overall metrics
             col1, col2, col3 = st.columns(3)
@@ -388,35 +498,14 @@ elif page == "Gap Analyzer":
             # Display gap chart
             st.subheader("Skill-Specific Gaps")
             
-            gap_df = pd.DataFrame([
-                {
-                    "Skill": item["skill"],
-                    "Market Demand": item["market_demand"],
-                    "Education Coverage": item["education_coverage"],
-                    "Gap Score": item["gap_score"]
-                }
-                for item in gap_data["skill_gaps"]
-            ])
-            
-            fig = go.Figure()
-            fig.add_trace(go.Bar(
-                x=gap_df["Skill"],
-                y=gap_df["Market Demand"],
-                name="Market Demand",
-                marker_color="rgb(55, 83, 109)"
-            ))
-            fig.add_trace(go.Bar(
-                x=gap_df["Skill"],
-                y=gap_df["Education Coverage"],
-                name="Education Coverage",
-                marker_color="rgb(26, 118, 255)"
-            ))
-            
-            fig.update_layout(
-                title="Market Demand vs. Education Coverage by Skill",
-                barmode="group"
-            )
+            gap_df = pd.DataFrame(gap_data["skill_gaps"]).rename(columns={
+                "skill": "Skill",
+                "market_demand": "Market Demand",
+                "education_coverage": "Education Coverage",
+                "gap_score": "Gap Score"
+            })
             
+            fig = build_gap_chart(gap_df, "Market Demand vs. Education Coverage by Skill")
             st.plotly_chart(fig, use_container_width=True)
             
             # Display recommendations
@@ -457,46 +546,18 @@ elif page == "Salary Signals":
     
     if st.button("Analyze Salary Trends"):
         with st.spinner("Analyzing salary data..."):
-            # Simulate API call
-            time.sleep(2)
-            
             # Sample data
-            salary_data = {
-                "by_location": {
-                    "San Francisco": {"mean": 152000, "median": 145000, "growth": "+5.2%"},
-                    "New York": {"mean": 145000, "median": 140000, "growth": "+4.8%"},
-                    "Remote": {"mean": 135000, "median": 130000, "growth": "+8.5%"},
-                    "Seattle": {"mean": 148000, "median": 142000, "growth": "+3.9%"},
-                    "Austin": {"mean": 138000, "median": 132000, "growth": "+7.2%"}
-                },
-                "by_title": {
-                    "AI Engineer": {"mean": 145000, "median": 140000, "growth": "+6.3%"},
-                    "ML Engineer": {"mean": 152000, "median": 148000, "growth": "+5.5%"},
-                    "RAG Engineer": {"mean": 160000, "median": 155000, "growth": "+12.8%"},
-                    "Data Scientist": {"mean": 138000, "median": 132000, "growth": "+4.2%"},
-                    "AI Product Manager": {"mean": 155000, "median": 148000, "growth": "+7.5%"}
-                },
-                "time_trends": [
-                    {"month": "2024-11", "mean_salary": 135000, "percent_change": 0},
-                    {"month": "2024-12", "mean_salary": 138500, "percent_change": 2.6},
-                    {"month": "2025-01", "mean_salary": 142000, "percent_change": 2.5},
-                    {"month": "2025-02", "mean_salary": 146500, "percent_change": 3.2},
-                    {"month": "2025-03", "mean_salary": 150000, "percent_change": 2.4},
-                    {"month": "2025-04", "mean_salary": 155000, "percent_change": 3.3}
-                ]
-            }
+            salary_data = mock_salary()
             
             # Display location chart
             st.subheader("Salary by Location")
-            location_df = pd.DataFrame([
-                {
-                    "Location": loc,
-                    "Mean Salary": data["mean"],
-                    "Growth": data["growth"]
-                }
-                for loc, data in salary_data["by_location"].items()
-                if loc in location_filter
-            ])
+            location_df = pd.DataFrame.from_dict(salary_data["by_location"], orient="index")
+            location_df = (
+                location_df[location_df.index.isin(location_filter)]
+                .rename_axis("Location")
+                .reset_index()
+                .rename(columns={"mean": "Mean Salary", "growth": "Growth"})
+            )
             
             fig_loc = px.bar(
                 location_df,
@@ -510,15 +571,13 @@ elif page == "Salary Signals":
             
             # Display role chart
             st.subheader("Salary by Role")
-            role_df = pd.DataFrame([
-                {
-                    "Role": role,
-                    "Mean Salary": data["mean"],
-                    "Growth": data["growth"]
-                }
-                for role, data in salary_data["by_title"].items()
-                if role in role_filter
-            ])
+            role_df = pd.DataFrame.from_dict(salary_data["by_title"], orient="index")
+            role_df = (
+                role_df[role_df.index.isin(role_filter)]
+                .rename_axis("Role")
+                .reset_index()
+                .rename(columns={"mean": "Mean Salary", "growth": "Growth"})
+            )
             
             fig_role = px.bar(
                 role_df,
@@ -532,29 +591,11 @@ elif page == "Salary Signals":
             
             # Display time trend
             st.subheader("Salary Trends Over Time")
-            time_df = pd.DataFrame(salary_data["time_trends"])
-            time_df["month"] = pd.to_datetime(time_df["month"])
-            
-            fig_time = px.line(
-                time_df,
-                x="month",
-                y="mean_salary",
-                title="Salary Trends Over Time",
-                labels={"mean_salary": "Mean Salary", "month": "Month"}
+            trends = tuple(
+                (point["month"], point["mean_salary"], point["percent_change"])
+                for point in salary_data["time_trends"]
             )
-            
-            # Add percent change as annotations
-            for i, row in time_df.iterrows():
-                if i > 0:  # Skip first month (no change)
-                    fig_time.add_annotation(
-                        x=row["month"],
-                        y=row["mean_salary"],
-                        text=f"+{row['percent_change']}%",
-                        showarrow=True,
-                        arrowhead=7,
-                        ax=0,
-                        ay=-40
-                    )
+            fig_time = build_salary_time_chart(trends)
             
             st.plotly_chart(fig_time, use_container_width=True)
             
@@ -654,61 +695,43 @@ elif page == "Data Collection":
                     }
                 })
         
-        # Display progress bar
-        with st.spinner("Starting data collection..."):
-            time.sleep(2)
-            
-            # Create new task
-            task_id = f"task_{datetime.now().strftime('%Y%m%d%H%M%S')}"
-            
-            # Show task info
-            st.success(f"Data collection task started with ID: {task_id}")
-            
-            # Progress tracking
-            progress_placeholder = st.empty()
-            progress_bar = st.progress(0)
-            
-            # Simulate progress updates
-            for i in range(101):
-                progress_bar.progress(i)
-                
-                status = "Initializing..."
-                if i > 10:
-                    status = "Connecting to job boards..."
-                if i > 30:
-                    status = "Extracting job listings..."
-                if i > 50:
-                    status = "Processing course data..."
-                if i > 70:
-                    status = "Analyzing forum discussions..."
-                if i > 90:
-                    status = "Finalizing data collection..."
-                
-                progress_placeholder.text(f"Status: {status} ({i}%)")
-                time.sleep(0.1)
-            
-            # Final status
-            st.success("Data collection completed successfully!")
-            
-            # Summary of collected data
-            st.subheader("Collection Summary")
-            
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Job Listings", "187")
-            with col2:
-                st.metric("Courses", "92")
-            with col3:
-                st.metric("Forum Posts", "143")
-            
-            # Sample of collected data
-            st.subheader("Sample Data Preview")
-            
-            sample_data = {
-                "Title": ["AI Engineer", "ML Engineer", "RAG Specialist", "Data Scientist"],
-                "Source": ["Indeed", "LinkedIn", "Wellfound", "Indeed"],
-                "Salary Range": ["$120K-$150K", "$135K-$165K", "$150K-$185K", "$110K-$140K"],
-                "Skills": ["Python, TensorFlow, PyTorch", "ML, SQL, Cloud", "RAG, Embeddings, LangChain", "Python, SQL, Tableau"]
-            }
-            
-            st.dataframe(pd.DataFrame(sample_data), hide_index=True)
\ No newline at end of file
+        # Create new task
+        task_id = f"task_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        
+        # Show task info
+        st.success(f"Data collection task started with ID: {task_id}")
+        
+        # Demo only: report each phase once instead of sleeping through a fake progress bar
+        with st.status("Collecting data...", expanded=True) as status:
+            for phase in [
+                "Connecting to job boards...",
+                "Extracting job listings...",
+                "Processing course data...",
+                "Analyzing forum discussions...",
+                "Finalizing data collection..."
+            ]:
+                status.write(phase)
+            status.update(label="Data collection completed successfully!", state="complete")
+            
+        # Summary of collected data
+        st.subheader("Collection Summary")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Job Listings", "187")
+        with col2:
+            st.metric("Courses", "92")
+        with col3:
+            st.metric("Forum Posts", "143")
+        
+        # Sample of collected data
+        st.subheader("Sample Data Preview")
+        
+        sample_data = {
+            "Title": ["AI Engineer", "ML Engineer", "RAG Specialist", "Data Scientist"],
+            "Source": ["Indeed", "LinkedIn", "Wellfound", "Indeed"],
+            "Salary Range": ["$120K-$150K", "$135K-$165K", "$150K-$185K", "$110K-$140K"],
+            "Skills": ["Python, TensorFlow, PyTorch", "ML, SQL, Cloud", "RAG, Embeddings, LangChain", "Python, SQL, Tableau"]
+        }
+        
+        st.dataframe(pd.DataFrame(sample_data), hide_index=True)
\ No newline at end of file
@@ -1,17 +1,175 @@
+from dataclasses import dataclass, field
+from functools import lru_cache
+import asyncio
+import logging
+import os
+import tempfile
+import threading
+import time
+
 from sentence_transformers import SentenceTransformer
 import faiss
 import numpy as np
+import streamlit as st
+import torch
+
+logger = logging.getLogger("vector_store")
+
+@dataclass
+class VectorStore:
+    model: SentenceTransformer
+    index: faiss.Index
+    # Texts are buffered and encoded/added to the index in batches
+    pending_texts: list = field(default_factory=list)
+    pending_ids: list = field(default_factory=list)
+    # Encoding runs unlocked; the lock only guards the buffer and FAISS calls,
+    # since the index can't be searched while it is being added to
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    # Held from draining the buffer until its vectors are in the index, so a search
+    # that flushes first waits for any in-flight flush and sees every buffered id
+    flush_lock: threading.Lock = field(default_factory=threading.Lock)
+    # Set when vectors have been added since the index was last written to disk
+    dirty: bool = False
+
+ADD_BATCH_SIZE = 256
+
+# Where the index is saved, so restarts don't have to re-encode every document
+INDEX_PATH = os.getenv("VECTOR_INDEX_PATH", "vector_index.faiss")
+
+# Seconds between background writes of a changed index; rewriting it after every
+# batch would make bulk ingestion write a quadratic amount of data
+SAVE_INTERVAL = float(os.getenv("VECTOR_INDEX_SAVE_INTERVAL", "60"))
+
+def _build_index() -> faiss.Index:
+    # HNSW graph gives sublinear search and, unlike IVF/PQ, needs no training pass before adds.
+    # Vectors are stored as fp16, halving memory and bytes read per search; unlike 8-bit
+    # quantization it also needs no training, so the store can still be filled incrementally.
+    # Embeddings are L2-normalised, so inner product is cosine similarity
+    index = faiss.IndexHNSWSQ(384, faiss.ScalarQuantizer.QT_fp16, 32, faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efConstruction = 200
+    index.hnsw.efSearch = 64
+    # FAISS stores the caller's integer ids itself, so search returns them directly
+    return faiss.IndexIDMap2(index)
+
+# Loaded once per process and shared across Streamlit sessions and reruns
+@st.cache_resource
+def get_store() -> VectorStore:
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    model = SentenceTransformer('all-MiniLM-L6-v2', device=device)  # 384-dim embeddings
+    if device == "cuda":
+        # fp16 weights run on tensor cores; outputs are cast back to float32 for FAISS
+        model.half()
+    index = faiss.read_index(INDEX_PATH) if os.path.exists(INDEX_PATH) else _build_index()
+    store = VectorStore(model=model, index=index)
+    threading.Thread(target=_autosave, args=(store,), daemon=True).start()
+    return store
+
+def get_model() -> SentenceTransformer:
+    return get_store().model
+
+def get_index() -> faiss.IndexIDMap2:
+    return get_store().index
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
-index = faiss.IndexFlatL2(384)  # Vector size for the above model
-id_map = []
+def _write_index(store: VectorStore, path: str = INDEX_PATH):
+    # Written to a uniquely named temporary file and renamed under the lock, so a crash
+    # or a concurrent save never publishes a truncated index
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    os.close(fd)
+    try:
+        with store.lock:
+            faiss.write_index(store.index, tmp_path)
+            os.replace(tmp_path, path)
+            if path == INDEX_PATH:
+                store.dirty = False
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
-def add_to_index(text, id):
-    vector = model.encode([text])
-    index.add(np.array(vector).astype("float32"))
-    id_map.append(id)
+def _autosave(store: VectorStore):
+    # Periodic write of whatever is already indexed; buffered texts wait for the next flush
+    while True:
+        time.sleep(SAVE_INTERVAL)
+        if not store.dirty:
+            continue
+        try:
+            _write_index(store)
+        except Exception:
+            # Retried on the next tick; the in-memory index is unaffected
+            logger.exception("Could not save vector index to %s", INDEX_PATH)
+
+def save(path: str = INDEX_PATH):
+    """Write the index, including any buffered texts, to disk for the next process to load"""
+    store = get_store()
+    _flush_pending(store)
+    _write_index(store, path)
+
+def _encode(model: SentenceTransformer, texts: list[str]) -> np.ndarray:
+    with torch.inference_mode():
+        vectors = model.encode(
+            texts,
+            batch_size=64,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+    return vectors.astype("float32", copy=False)
+
+def _flush_pending(store: VectorStore):
+    with store.flush_lock:
+        with store.lock:
+            texts, ids = store.pending_texts[:], store.pending_ids[:]
+            store.pending_texts.clear()
+            store.pending_ids.clear()
+        if texts:
+            add_many_to_index(texts, ids)
+
+def add_many_to_index(texts: list[str], ids: list[int]):
+    store = get_store()
+    vectors = _encode(store.model, texts)
+    with store.lock:
+        store.index.add_with_ids(vectors, np.asarray(ids, dtype=np.int64))
+        store.dirty = True
+
+def add_to_index(text, id: int):
+    store = get_store()
+    with store.lock:
+        store.pending_texts.append(text)
+        store.pending_ids.append(id)
+        full = len(store.pending_texts) >= ADD_BATCH_SIZE
+    if full:
+        _flush_pending(store)
+
+def search_batch(queries: list[str], top_k=5) -> list[list[int]]:
+    store = get_store()
+    _flush_pending(store)
+    vectors = _encode(store.model, queries)
+    with store.lock:
+        D, I = store.index.search(vectors, top_k)
+    # FAISS pads with -1 when fewer than top_k vectors are indexed
+    return [row[row >= 0].tolist() for row in I]
+
+# Repeated queries (e.g. Streamlit reruns) skip the transformer forward pass;
+# bytes keep the cached value immutable
+@lru_cache(maxsize=1024)
+def _encode_query(text: str) -> bytes:
+    return _encode(get_model(), [text]).tobytes()
 
 def search(query, top_k=5):
-    vector = model.encode([query])
-    D, I = index.search(np.array(vector).astype("float32"), top_k)
-    return [id_map[i] for i in I[0]]
+    store = get_store()
+    _flush_pending(store)
+    vector = np.frombuffer(_encode_query(query), dtype=np.float32).reshape(1, -1)
+    with store.lock:
+        D, I = store.index.search(vector, top_k)
+    return I[0][I[0] >= 0].tolist()
+
+# Async variants run the blocking encode/search in a worker thread, so one session's
+# forward pass doesn't hold up the event loop serving everyone else
+async def add_many_to_index_async(texts: list[str], ids: list[int]):
+    await asyncio.to_thread(add_many_to_index, texts, ids)
+
+async def search_async(query, top_k=5) -> list[int]:
+    return await asyncio.to_thread(search, query, top_k)
+
+async def search_batch_async(queries: list[str], top_k=5) -> list[list[int]]:
+    return await asyncio.to_thread(search_batch, queries, top_k)
@@ -0,0 +1,165 @@
+"""
+arq worker that runs crawl tasks outside the API process.
+
+Consumes the jobs enqueued by trend_analyzer's /crawl endpoints, so run it
+alongside that app (not trendhire_api, which has no crawl endpoints).
+
+Run with: arq worker.WorkerSettings
+"""
+
+import os
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import aiohttp
+from arq.connections import RedisSettings
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from mcp_client_implementation import Listing, MCPClient, MCPSourceCrawler, SourceConfig
+from database import AsyncSessionLocal, async_engine
+from models import Job
+from task_store import save_task
+from log_queue import configure_logging
+
+log_listener = configure_logging(logging.INFO)
+logger = logging.getLogger("trendhire_worker")
+
+API_KEY = os.getenv("BRIGHT_DATA_API_KEY")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Scraped listings are written to the database in batches of this size
+JOB_BATCH_SIZE = 500
+
+# Database connections opened at startup, so the first crawl doesn't pay for the handshake
+DB_WARM_POOL_SIZE = int(os.getenv("DB_WARM_POOL_SIZE", "5"))
+
+
+def _job_record(listing: Listing) -> Dict:
+    """Map a scraped listing onto the columns of the jobs table"""
+    return {
+        "title": listing.title,
+        "company": listing.company,
+        "location": listing.location,
+        "source": listing.source,
+        "url": listing.url,
+        "raw_data": listing.raw,
+        "created_at": datetime.utcnow(),
+    }
+
+
+async def _flush_jobs(session, batch: List[Dict]):
+    """Insert a batch of jobs in one statement, skipping URLs that are already stored"""
+    await session.execute(
+        pg_insert(Job).values(batch).on_conflict_do_nothing(index_elements=["url"])
+    )
+    await session.commit()
+
+
+async def run_crawl_task(ctx, task_id: str, sources: List[SourceConfig], query: str = "",
+                         location: Optional[str] = None, max_pages: int = 1):
+    """Crawl every source for the task and store the listings"""
+    try:
+        mcp_client = MCPClient(api_key=API_KEY, session=ctx["session"])
+        
+        results = []
+        batch = []
+        async with AsyncSessionLocal() as session:
+            for source_config in sources:
+                crawler = MCPSourceCrawler(mcp_client, source_config, executor=ctx["pool"])
+                count = 0
+                try:
+                    # Listings are stored while later pages are still being fetched
+                    async for listing in crawler.search_async(query, location, max_pages):
+                        batch.append(_job_record(listing))
+                        count += 1
+                        if len(batch) >= JOB_BATCH_SIZE:
+                            await _flush_jobs(session, batch)
+                            batch = []
+                except Exception as e:
+                    results.append({
+                        "source": source_config.name,
+                        "error": str(e),
+                        "listings": count,
+                        "failed_pages": crawler.failed_pages
+                    })
+                    continue
+                results.append({
+                    "source": source_config.name,
+                    "listings": count,
+                    "failed_pages": crawler.failed_pages
+                })
+            
+            if batch:
+                await _flush_jobs(session, batch)
+        
+        # Update task status
+        await save_task(
+            ctx["redis"],
+            task_id,
+            status="completed",
+            completed_at=datetime.now(),
+            result_summary={
+                "sources_processed": len(results),
+                "successful_crawls": sum(1 for r in results if "error" not in r),
+                "failed_crawls": sum(1 for r in results if "error" in r),
+                "listings_collected": sum(r.get("listings", 0) for r in results),
+                "failed_pages": sum(r.get("failed_pages", 0) for r in results),
+            }
+        )
+        
+        logger.info("Task %s completed successfully", task_id)
+        
+    except Exception as e:
+        logger.exception("Task %s failed", task_id)
+        await save_task(ctx["redis"], task_id, status="failed", result_summary={"error": str(e)})
+
+
+async def warm_connection_pool(pool_size: int = 5):
+    """Open pool_size database connections up front so the first batch insert reuses one"""
+    async def ping():
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.gather(*(ping() for _ in range(pool_size)))
+    except Exception as e:
+        logger.warning("Could not warm database connection pool: %s", e)
+    else:
+        logger.info("Warmed %d database connections", pool_size)
+
+
+async def startup(ctx):
+    """Create the HTTP session and parser pool shared by every job on this worker"""
+    log_listener.start()
+    ctx["session"] = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=1024,
+            limit_per_host=64,
+            keepalive_timeout=30,
+            ttl_dns_cache=300,
+            enable_cleanup_closed=True
+        )
+    )
+    # HTML parsing is CPU-bound, so it runs in worker processes
+    ctx["pool"] = ProcessPoolExecutor(max_workers=os.cpu_count())
+    await warm_connection_pool(DB_WARM_POOL_SIZE)
+
+
+async def shutdown(ctx):
+    await ctx["session"].close()
+    ctx["pool"].shutdown()
+    await async_engine.dispose()
+    log_listener.stop()
+
+
+class WorkerSettings:
+    functions = [run_crawl_task]
+    on_startup = startup
+    on_shutdown = shutdown
+    redis_settings = RedisSettings.from_dsn(REDIS_URL)
+    # Crawls running at once on each worker process
+    max_jobs = int(os.getenv("CRAWL_MAX_JOBS", "10"))